@@ -1,64 +1,30 @@
+import os
+import time
+from itertools import islice
+
 import plotly.graph_objects as go
 import streamlit as st
 
 # Local libraries
-from config import create_model
+from config import create_model, check_tool_schemas
 from session import TopologicSession, SessionContext
 from tools import list_session_items, get_object_info, clear_session
-from tools import create_vertex, create_cube, create_edge, create_wire, create_face, create_rectangle, create_circle, create_prism, create_cylinder
+from tools import create_many, create_vertex, create_cube, create_edge, create_wire, create_face, create_rectangle, create_circle, create_prism, create_cylinder
 
 # AI
 from langchain.agents import create_agent
 
-# Topologic
-from topologicpy.Cluster import Cluster
-from topologicpy.Plotly import Plotly
-
 # 1. Page Config & Dark/Coral Theme CSS
 st.set_page_config(layout="wide", page_title="Topologic Vibe")
 
-st.markdown("""
-    <style>
-        .block-container { padding-bottom: 0px; }
-        
-        /* Layout alignment for the chat input row */
-        [data-testid="stHorizontalBlock"] {
-            align-items: end;
-        }
-
-        /* Button Styling: White border/text for Dark background vibe */
-        .stButton > button {
-            border-radius: 4px !important;
-            height: 44px !important;
-            width: 100% !important;
-            border: 2px solid #FF7043 !important; /* Coral Accent */
-            background-color: transparent !important;
-            color: #FF7043 !important;
-            transition: all 0.3s ease;
-        }
-        
-        .stButton > button:hover {
-            background-color: #FF7043 !important;
-            color: #ffffff !important;
-        }
-
-        .stButton > button:disabled {
-            border-color: #444444 !important;
-            color: #666666 !important;
-        }
-
-        /* Custom styling for the "Empty Canvas" message in dark mode */
-        .dark-info-box {
-            padding: 1rem;
-            background-color: rgba(255, 255, 255, 0.05);
-            border-left: 5px solid #FF7043;
-            color: #E0E0E0;
-            border-radius: 4px;
-            margin-bottom: 1rem;
-            font-family: sans-serif;
-        }
-    </style>
-""", unsafe_allow_html=True)
+@st.cache_resource(show_spinner=False)
+def load_css():
+    with open(os.path.join(os.path.dirname(__file__), "style.css")) as f:
+        return f"<style>{f.read()}</style>"
+
+# Emitted on every run on purpose, streamlit drops elements a rerun doesn't produce.
+# st.html with only <style> goes to the event container and skips markdown parsing.
+st.html(load_css())
 
 # 2. Define the Modal (Dialog)
 @st.dialog("Session Objects")
@@ -66,18 +32,80 @@ def show_inventory(session):
     if not session.items:
         st.write("No objects found.")
     else:
-        items_data = [
-            {"Name": name, "Type": type(obj).__name__} 
-            for name, obj in session.items.items()
-        ]
-        st.table(items_data)
-
-# 3. Agent & Session Setup
-if "agent" not in st.session_state:
-    st.session_state.agent = create_agent(
+        # session_state is already per user, so the O(1) version counter is enough as key
+        key = session.version
+        cached = st.session_state.get("_inv_cache")
+        if cached is None or cached[0] != key:
+            items_data = [
+                {"Name": name, "Type": type(obj).__name__} 
+                for name, obj in session.items.items()
+            ]
+            cached = st.session_state["_inv_cache"] = (key, items_data)
+        st.table(cached[1])
+
+# 3. Cached 3D Figure
+def fingerprint(session):
+    # O(1) key of the current object set, the session uid keeps users apart in
+    # process-wide caches and the version changes on every add/clear
+    return (session.uid, session.version)
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def build_fig(key, _objs):
+    # '_objs' is not hashed by streamlit, the cache is keyed only by 'key'.
+    # Topologic is imported lazily so it only loads once there is something to draw.
+    from topologicpy.Cluster import Cluster
+    from topologicpy.Plotly import Plotly
+
+    scene = Cluster.ByTopologies(_objs)
+    fig = go.Figure(data=Plotly.DataByTopology(scene))
+    
+    # 1. FACE TRANSPARENCY (0.0 to 1.0), flat shading for a better architectural look
+    fig.update_traces(opacity=0.1, flatshading=True, selector=dict(type='mesh3d'))
+    fig.update_traces(opacity=0.1, selector=dict(type='surface'))
+    
+    # 2. EDGES
+    fig.update_traces(line=dict(width=3, color='#F5F5F4'), opacity=0.8, selector=dict(mode='lines'))
+    
+    # 3. VERTEXES
+    fig.update_traces(marker=dict(size=7, color='#FF7043'), opacity=0.8, selector=dict(mode='markers'))
+    
+    fig.update_layout(
+        height=750, 
+        margin=dict(l=0, r=0, b=0, t=0),
+        paper_bgcolor='#0E1117',
+        plot_bgcolor='#0E1117',
+        scene=dict(
+            xaxis=dict(showgrid=True, gridcolor='#333333', zerolinecolor='#444444'),
+            yaxis=dict(showgrid=True, gridcolor='#333333', zerolinecolor='#444444'),
+            zaxis=dict(showgrid=True, gridcolor='#333333', zerolinecolor='#444444'),
+            bgcolor='#0E1117',
+            aspectmode='data'
+        )
+    )
+    return fig
+
+# 4. 3D Viewer
+def render_viz(session):
+    objs = list(session.items.values())
+    
+    if not objs:
+        st.markdown('<div class="dark-info-box"><b>Canvas Status:</b> The canvas is empty.</div>', unsafe_allow_html=True)
+    
+    if objs:
+        # Reruns without geometry changes reuse the figure
+        fig = build_fig(fingerprint(session), objs)
+        
+        st.plotly_chart(fig, width='stretch', theme=None)
+
+# 5. Agent & Session Setup
+@st.cache_resource(show_spinner=False)
+def get_agent():
+    # Shared across sessions, the per-user state travels through 'context' on each call
+    return create_agent(
         model=create_model(),
-        tools=[
+        tools=check_tool_schemas([
             clear_session,
+            create_many,
             create_cube,
             create_vertex,
             create_wire,
@@ -90,18 +118,41 @@ if "agent" not in st.session_state:
             create_edge,
             list_session_items,
             get_object_info
-        ],
+        ]),
         context_schema=SessionContext,
-        system_prompt="You are a topologicpy library assistant."
+        system_prompt=(
+            "You are a topologicpy library assistant. "
+            "When building more than one object, use the create_many tool to create them all in a single call."
+        )
     )
 
+def summarize_history(session, keep: int = 12):
+    # Folds everything but the last 'keep' messages into the session summary, 'keep'
+    # must not exceed the agent window (2 * max_turns). The full history is still
+    # kept for the chat replay
+    end = len(session.messages) - keep
+    transcript = "\n".join(
+        f"{msg['role']}: {msg['content']}" for msg in islice(session.messages, session.summarized, end)
+    )
+    try:
+        response = create_model().invoke(
+            "Summarize this conversation with a topologicpy assistant in a few sentences, "
+            "keeping the objects built, their names and dimensions.\n\n"
+            f"Previous summary: {session.summary or 'None'}\n\n{transcript}"
+        )
+    except Exception:
+        # The turn already succeeded, skip compaction and retry on a later turn
+        return False
+    session.set_summary(response.text, end)
+    return True
+
 if "topologic_session" not in st.session_state:
     st.session_state.topologic_session = TopologicSession()
 
 session = st.session_state.topologic_session
 session_context = SessionContext(session=session)
 
-# 4. Layout
+# 6. Layout
 col_chat, col_viz = st.columns([1, 2], gap="large")
 
 with col_chat:
@@ -111,13 +162,13 @@ with col_chat:
         st.markdown("### TopologicVibe")
     with ctrl_col2:
         if st.button(label="", icon=":material/delete_outline:", help="Clear chat history", use_container_width=True):
-            session.messages = []
-            st.session_state.messages = []
+            session.clear_messages()
             st.rerun()
     chat_container = st.container(height=650)
 
+    # Alias of the session history, add_message() appends in place so it stays in sync
     if "messages" not in st.session_state:
-        st.session_state.messages = session.get_messages()
+        st.session_state.messages = session.messages
 
     with chat_container:
         for msg in st.session_state.messages:
@@ -125,38 +176,32 @@ with col_chat:
                 st.markdown(msg["content"])
 
     # INPUT SECTION: 
-    has_objects = len(session.items) > 0
-    
     input_row = st.container()
     with input_row:
         chat_col, btn_col = st.columns([8, 1.2])
         
         with chat_col:
             prompt = st.chat_input("What do you want to build?")
-            
-        with btn_col:
-            if st.button(label="", 
-                         icon=":material/view_in_ar:",
-                         help="Show Session Objects", 
-                         disabled=not has_objects,
-                         use_container_width=True):
-                show_inventory(session)
 
     if prompt:
         # Save user message to session and UI
         session.add_message("user", prompt)
-        st.session_state.messages = session.get_messages()
         with chat_container:
             with st.chat_message("user"):
                 st.markdown(prompt)
 
-        # Send the full session history to the agent stream
-        messages_for_agent = session.get_messages()
+        # Send a bounded window of the history (plus the running summary) to the agent stream
+        messages_for_agent = session.get_recent_messages()
 
-        # Track the last assistant text received so we can save it once streaming completes
-        last_assistant_text = ""
+        # Single assistant bubble, updated in place while the agent streams
+        with chat_container:
+            placeholder = st.chat_message("assistant").empty()
+        buf = []
+        # Only the model's own text is persisted, tool-call placeholders are display-only
+        text_parts = []
+        last_flush = time.monotonic()
 
-        for chunk in st.session_state.agent.stream(
+        for chunk in get_agent().stream(
             {"messages": messages_for_agent},
             context=session_context,
             stream_mode="updates",
@@ -165,60 +210,38 @@ with col_chat:
                 content = data['messages'][-1].content_blocks
                 if step == "model":
                     # extract text or tool_call placeholder
-                    piece = content[0]["text"] if content[0]["type"] != "tool_call" else f"Using '{content[0]['name']}' tool ..."
-                    last_assistant_text = piece
-                    with chat_container:
-                        with st.chat_message("assistant"):
-                            st.markdown(piece)
+                    if content[0]["type"] != "tool_call":
+                        piece = content[0]["text"]
+                        text_parts.append(piece)
+                    else:
+                        piece = f"Using '{content[0]['name']}' tool ..."
+                    buf.append(piece)
+                    # Batch redraws, flush at most every 50ms
+                    now = time.monotonic()
+                    if now - last_flush > 0.05:
+                        placeholder.markdown("\n\n".join(buf))
+                        last_flush = now
+
+        placeholder.markdown("\n\n".join(buf))
+        last_assistant_text = "\n\n".join(text_parts)
 
         # After streaming completes, persist assistant response into the session
         if last_assistant_text:
             session.add_message("assistant", last_assistant_text)
-            st.session_state.messages = session.get_messages()
 
-        st.rerun()
+        if session.needs_summary():
+            summarize_history(session)
+
+    # Rendered after the agent runs so it reflects objects created this turn without a rerun
+    has_objects = len(session.items) > 0
+    with btn_col:
+        if st.button(label="", 
+                     icon=":material/view_in_ar:",
+                     help="Show Session Objects", 
+                     disabled=not has_objects,
+                     use_container_width=True):
+            show_inventory(session)
 
 # VIZ SECTION
 with col_viz:
-    objs = [obj for name, obj in session.items.items()]
-    
-    if not objs:
-        st.markdown('<div class="dark-info-box"><b>Canvas Status:</b> The canvas is empty.</div>', unsafe_allow_html=True)
-    
-    if objs:
-        scene = Cluster.ByTopologies(objs)
-        data = Plotly.DataByTopology(scene)
-        fig = go.Figure(data=data)
-        
-        for trace in fig.data:
-            # 1. FACE TRANSPARENCY
-            if trace.type in ['mesh3d', 'surface']:
-                trace.opacity = 0.1  # Set transparency (0.0 to 1.0)
-                trace.flatshading = True # Better architectural look
-            
-            # 2. EDGES
-            if hasattr(trace, 'line'):
-                trace.line.width = 3
-                trace.line.color = '#F5F5F4'
-                trace.opacity = 0.8  # Ensure edges are fully opaque
-            
-            # 3. VERTEXES
-            if hasattr(trace, 'marker'):
-                trace.marker.size = 7
-                trace.marker.color = '#FF7043'
-        
-        fig.update_layout(
-            height=750, 
-            margin=dict(l=0, r=0, b=0, t=0),
-            paper_bgcolor='#0E1117',
-            plot_bgcolor='#0E1117',
-            scene=dict(
-                xaxis=dict(showgrid=True, gridcolor='#333333', zerolinecolor='#444444'),
-                yaxis=dict(showgrid=True, gridcolor='#333333', zerolinecolor='#444444'),
-                zaxis=dict(showgrid=True, gridcolor='#333333', zerolinecolor='#444444'),
-                bgcolor='#0E1117',
-                aspectmode='data'
-            )
-        )
-        
-        st.plotly_chart(fig, width='stretch', theme=None)
\ No newline at end of file
+    render_viz(session)
@@ -1,8 +1,8 @@
-# Topologic
-from topologicpy.Topology import Topology
-from topologicpy.Dictionary import Dictionary
-
 def assign_name(obj, name: str):
+    # Topologic is imported lazily, see tools.py
+    from topologicpy.Topology import Topology
+    from topologicpy.Dictionary import Dictionary
+
     keys = ["name"]
     values = [name]
     config = Dictionary.ByKeysValues(keys, values)
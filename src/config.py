@@ -3,13 +3,42 @@ import os
 import streamlit as st
 
 # LangChain
+from langchain_core.utils.function_calling import convert_to_openai_tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 
 os.environ["GEMINI_API_KEY"] = st.secrets["GEMINI_API_KEY"]
 
+@st.cache_resource(show_spinner=False)
 def create_model():
     return ChatGoogleGenerativeAI(
         model=st.secrets["GEMINI_MODEL"],
         max_retries=2,
-    )
\ No newline at end of file
+    )
+
+def _untyped_objects(schema, path):
+    # Gemini declares object parameters without properties as STRING, so the model
+    # would send text where the tool expects an object
+    if not isinstance(schema, dict):
+        return []
+    found = []
+    if schema.get("type") == "object" and not schema.get("properties"):
+        found.append(path)
+    for key, value in schema.get("properties", {}).items():
+        found += _untyped_objects(value, f"{path}.{key}")
+    if "items" in schema:
+        found += _untyped_objects(schema["items"], f"{path}[]")
+    for option in schema.get("anyOf", []):
+        found += _untyped_objects(option, path)
+    return found
+
+def check_tool_schemas(tools):
+    """Raises ValueError if a tool has a parameter Gemini can't represent."""
+    found = []
+    for t in tools:
+        function = convert_to_openai_tool(t)["function"]
+        for key, value in function.get("parameters", {}).get("properties", {}).items():
+            found += _untyped_objects(value, f"{function['name']}.{key}")
+    if found:
+        raise ValueError(f"Tool parameters without a schema: {', '.join(found)}")
+    return tools
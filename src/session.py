@@ -1,15 +1,48 @@
+import threading
+import uuid
+from collections import Counter, deque
 from dataclasses import dataclass
+from itertools import islice
 
 
 class TopologicSession:
     def __init__(self):
         self.items = {}
-        self.messages = []
+        # Unique per session so process-wide caches never mix up two users' objects
+        self.uid = uuid.uuid4().hex
+        # Bounded history, the oldest messages are dropped once the limit is reached
+        self.messages = deque(maxlen=200)
+        # Bumped whenever items change so cached figures are invalidated
+        self.version = 0
+        # Guards items, the agent may run parallel tool calls on worker threads
+        self._lock = threading.Lock()
+        # Per-kind counters for short auto-generated names
+        self._counters = Counter()
+        # Running summary of the first 'summarized' messages, used to bound agent context
+        self.summary = ""
+        self.summarized = 0
 
     def add(self, name, obj):
-        self.items[name] = obj
+        with self._lock:
+            self.items[name] = obj
+            self.version += 1
         return f"Object '{name}' saved."
 
+    def clear_items(self):
+        # Cleared in place, the version bump invalidates figures cached for the old items
+        with self._lock:
+            self.items.clear()
+            self.version += 1
+        return True
+
+    def next_name(self, kind: str):
+        with self._lock:
+            while True:
+                self._counters[kind] += 1
+                name = f"{kind}{self._counters[kind]}"
+                if name not in self.items:
+                    return name
+
     def get_all_names(self):
         return list(self.items.keys())
 
@@ -18,14 +51,39 @@ class TopologicSession:
 
     def add_message(self, role: str, content: str):
         entry = {"role": role, "content": content}
+        if len(self.messages) == self.messages.maxlen:
+            # The oldest message is about to be dropped, keep the summary offset aligned
+            self.summarized = max(self.summarized - 1, 0)
         self.messages.append(entry)
         return entry
 
     def get_messages(self):
-        return list(self.messages)
+        # Returned without copying, callers treat it as read-only
+        return self.messages
+
+    def get_recent_messages(self, max_turns: int = 12):
+        # Only the last turns are sent to the agent, older ones are covered by the summary
+        start = max(self.summarized, len(self.messages) - 2 * max_turns)
+        recent = list(islice(self.messages, start, None))
+        if self.summary:
+            return [{"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}] + recent
+        return recent
+
+    def needs_summary(self, max_turns: int = 12):
+        # Same bound as the window in get_recent_messages, so every message is either
+        # in the summary or in the window
+        return len(self.messages) - self.summarized > 2 * max_turns
+
+    def set_summary(self, summary: str, summarized: int):
+        self.summary = summary
+        self.summarized = summarized
+        return True
 
     def clear_messages(self):
-        self.messages = []
+        # Cleared in place so aliases (e.g. st.session_state.messages) stay valid
+        self.messages.clear()
+        self.summary = ""
+        self.summarized = 0
         return True
 
 
@@ -1,23 +1,42 @@
-from typing import List, Optional
-import uuid
+from typing import List, Literal, Optional
 
 # General
 from dataclasses import dataclass
+from functools import lru_cache
 
 # Local libraries
 from common import assign_name
-from session import SessionContext
+from session import SessionContext, TopologicSession
 
 # LangChain
 from langchain.tools import tool, ToolRuntime
+from pydantic import BaseModel, Field
 
-# Topologic
-from topologicpy.Vertex import Vertex
-from topologicpy.Topology import Topology
-from topologicpy.Cell import Cell
-from topologicpy.Edge import Edge
-from topologicpy.Wire import Wire
-from topologicpy.Face import Face
+# Topologic modules are imported inside the functions that use them, so a chat-only
+# session never loads the 3D stack
+
+@lru_cache(maxsize=4096)
+def _vertex(x: float, y: float, z: float = 0.0):
+    # Shared construction vertices, never named or registered in the session
+    from topologicpy.Vertex import Vertex
+    return Vertex.ByCoordinates(x, y, z)
+
+def _create_cylinder(
+    session: TopologicSession,
+    radius: float,
+    height: float,
+    name: Optional[str] = None
+):
+    from topologicpy.Cell import Cell
+
+    if name is None:
+        name = session.next_name("cylinder")
+    
+    cylinder = Cell.Cylinder(radius=radius, height=height)
+    cylinder = assign_name(cylinder, name)
+    session.add(name, cylinder)
+    
+    return f"A cylinder with name {name} has been created and registered"
 
 @tool
 def create_cylinder(
@@ -32,14 +51,25 @@ def create_cylinder(
         height: height of the cylinder.
         name (optional): custom name of the cylinder.
     """
+    return _create_cylinder(runtime.context.session, radius, height, name)
+
+def _create_prism(
+    session: TopologicSession,
+    width: float,
+    length: float,
+    height: float,
+    name: Optional[str] = None
+):
+    from topologicpy.Cell import Cell
+
     if name is None:
-        name = f"cylinder {uuid.uuid4()}"
+        name = session.next_name("prism")
     
-    cylinder = Cell.Cylinder(radius=radius, height=height)
-    cylinder = assign_name(cylinder, name)
-    runtime.context.session.add(name, cylinder)
+    prism = Cell.Prism(width=width, length=length, height=height)
+    prism = assign_name(prism, name)
+    session.add(name, prism)
     
-    return f"A cylinder with name {name} has been created and registered"
+    return f"A prism with name {name} has been created and registered"
 
 @tool
 def create_prism(
@@ -56,14 +86,26 @@ def create_prism(
         height: height of the prism.
         name (optional): custom name of the prism.
     """
+    return _create_prism(runtime.context.session, width, length, height, name)
+
+def _create_circle(
+    session: TopologicSession,
+    radius: float,
+    origin: Optional[List[float]] = None,
+    name: Optional[str] = None
+):
+    from topologicpy.Face import Face
+
+    if origin is not None:
+        origin = _vertex(*map(float, origin))
     if name is None:
-        name = f"prism {uuid.uuid4()}"
+        name = session.next_name("circle")
     
-    prism = Cell.Prism(width=width, length=length, height=height)
-    prism = assign_name(prism, name)
-    runtime.context.session.add(name, prism)
+    circle = Face.Circle(origin=origin, radius=radius)
+    circle = assign_name(circle, name)
+    session.add(name, circle)
     
-    return f"A prism with name {name} has been created and registered"
+    return f"A circle with name {name} has been created and registered"
 
 @tool
 def create_circle(
@@ -78,16 +120,27 @@ def create_circle(
         origin (optional): origin of the circle that contains [x, y, z] coordinates, by default [0, 0, 0].
         name (optional): custom name of the circle.
     """
+    return _create_circle(runtime.context.session, radius, origin, name)
+
+def _create_rectangle(
+    session: TopologicSession,
+    length: float,
+    width: float,
+    origin: Optional[List[float]] = None,
+    name: Optional[str] = None
+):
+    from topologicpy.Face import Face
+
     if origin is not None:
-        origin = Vertex.ByCoordinates(*origin)
+        origin = _vertex(*map(float, origin))
     if name is None:
-        name = f"circle {uuid.uuid4()}"
+        name = session.next_name("rectangle")
     
-    circle = Face.Circle(origin=origin, radius=radius)
-    circle = assign_name(circle, name)
-    runtime.context.session.add(name, circle)
+    rectangle = Face.Rectangle(origin=origin, length=length, width=width)
+    rectangle = assign_name(rectangle, name)
+    session.add(name, rectangle)
     
-    return f"A circle with name {name} has been created and registered"
+    return f"A rectangle with name {name} has been created and registered"
 
 @tool
 def create_rectangle(
@@ -104,16 +157,26 @@ def create_rectangle(
         origin (optional): origin of the rectangle that contains [x, y, z] coordinates, by default [0, 0, 0].
         name (optional): custom name of the rectangle.
     """
-    if origin is not None:
-        origin = Vertex.ByCoordinates(*origin)
+    return _create_rectangle(runtime.context.session, length, width, origin, name)
+
+def _create_face(
+    session: TopologicSession,
+    points: List[List[float]],
+    name: Optional[str] = None
+):
+    from topologicpy.Face import Face
+
+    if len(points) < 3:
+        return "Error: At least three points are required to create a face."
     if name is None:
-        name = f"rectangle {uuid.uuid4()}"
+        name = session.next_name("face")
     
-    rectangle = Face.Rectangle(origin=origin, length=length, width=width)
-    rectangle = assign_name(rectangle, name)
-    runtime.context.session.add(name, rectangle)
+    vertices = [_vertex(*map(float, point)) for point in points]
+    face = Face.ByVertices(vertices)
+    face = assign_name(face, name)
+    session.add(name, face)
     
-    return f"A rectangle with name {name} has been created and registered"
+    return f"A face with name {name} has been created and registered"
 
 @tool
 def create_face(
@@ -128,17 +191,27 @@ def create_face(
 
         To create a face, provide a list of minimum three points with their [x, y, z] coordinates.
     """
-    if len(points) < 3:
-        return "Error: At least three points are required to create a face."
+    return _create_face(runtime.context.session, points, name)
+
+def _create_wire(
+    session: TopologicSession,
+    points: List[List[float]],
+    is_closed: Optional[bool] = True,
+    name: Optional[str] = None
+):
+    from topologicpy.Wire import Wire
+
+    if len(points) < 2:
+        return "Error: At least two points are required to create a wire."
     if name is None:
-        name = f"face {uuid.uuid4()}"
+        name = session.next_name("wire")
     
-    vertices = [Vertex.ByCoordinates(*point) for point in points]
-    face = Face.ByVertices(vertices)
-    face = assign_name(face, name)
-    runtime.context.session.add(name, face)
+    vertices = [_vertex(*map(float, point)) for point in points]
+    wire = Wire.ByVertices(vertices, close=is_closed)
+    wire = assign_name(wire, name)
+    session.add(name, wire)
     
-    return f"A face with name {name} has been created and registered"
+    return f"A wire with name {name} has been created and registered"
 
 @tool
 def create_wire(
@@ -155,17 +228,23 @@ def create_wire(
 
         To create a wire, provide a list of minimum two points with their [x, y, z] coordinates.
     """
-    if len(points) < 2:
-        return "Error: At least two points are required to create a wire."
+    return _create_wire(runtime.context.session, points, is_closed, name)
+
+def _create_vertex(
+    session: TopologicSession,
+    position: Optional[List[float]] = [0.0, 0.0, 0.0],
+    name: Optional[str] = None
+):
+    from topologicpy.Vertex import Vertex
+
     if name is None:
-        name = f"wire {uuid.uuid4()}"
+        name = session.next_name("vertex")
     
-    vertices = [Vertex.ByCoordinates(*point) for point in points]
-    wire = Wire.ByVertices(vertices, close=is_closed)
-    wire = assign_name(wire, name)
-    runtime.context.session.add(name, wire)
+    vertex = Vertex.ByCoordinates(*position)
+    vertex = assign_name(vertex, name)
+    session.add(name, vertex)
     
-    return f"A wire with name {name} has been created and registered"
+    return f"A vertex with name {name} has been created and registered"
 
 @tool
 def create_vertex(
@@ -178,14 +257,26 @@ def create_vertex(
         position: [x, y, z] coordinates of the vertex. By default [0.0, 0.0, 0.0].
         name (optional): custom name of the vertex.
     """
+    return _create_vertex(runtime.context.session, position, name)
+
+def _create_edge(
+    session: TopologicSession,
+    start: List[float],
+    end: List[float],
+    name: Optional[str] = None
+):
+    from topologicpy.Edge import Edge
+
     if name is None:
-        name = f"vertex {uuid.uuid4()}"
+        name = session.next_name("edge")
     
-    vertex = Vertex.ByCoordinates(*position)
-    vertex = assign_name(vertex, name)
-    runtime.context.session.add(name, vertex)
+    start_vertex = _vertex(*map(float, start))
+    end_vertex = _vertex(*map(float, end))
+    edge = Edge.ByVertices(start_vertex, end_vertex)
+    edge = assign_name(edge, name)
+    session.add(name, edge)
     
-    return f"A vertex with name {name} has been created and registered"
+    return f"An edge with name {name} has been created and registered"
 
 @tool
 def create_edge(
@@ -200,16 +291,26 @@ def create_edge(
         end: [x, y, z] coordinates of the end point.
         name (optional): custom name of the edge.
     """
+    return _create_edge(runtime.context.session, start, end, name)
+
+def _create_cube(
+    session: TopologicSession,
+    size: int,
+    origin: Optional[List[float]] = None,
+    name: Optional[str] = None
+):
+    from topologicpy.Cell import Cell
+
+    if origin is not None:
+        origin = _vertex(*map(float, origin))
     if name is None:
-        name = f"edge {uuid.uuid4()}"
+        name = session.next_name("cube")
     
-    start_vertex = Vertex.ByCoordinates(*start)
-    end_vertex = Vertex.ByCoordinates(*end)
-    edge = Edge.ByVertices(start_vertex, end_vertex)
-    edge = assign_name(edge, name)
-    runtime.context.session.add(name, edge)
+    cube = Cell.Cube(origin=origin, size=size)
+    cube = assign_name(cube, name)
+    session.add(name, cube)
     
-    return f"An edge with name {name} has been created and registered"
+    return f"A cube with name {name} has been created and registered"
 
 @tool
 def create_cube(
@@ -224,16 +325,66 @@ def create_cube(
         origin (optional): origin of the cube that contains [x, y, z] coordinates, by default [0, 0, 0].
         name (optional): custom name of the cube.
     """
-    if origin is not None:
-        origin = Vertex.ByCoordinates(*origin)
-    if name is None:
-        name = f"cube {uuid.uuid4()}"
-    
-    cube = Cell.Cube(origin=origin, size=size)
-    cube = assign_name(cube, name)
-    runtime.context.session.add(name, cube)
+    return _create_cube(runtime.context.session, size, origin, name)
+
+_CREATORS = {
+    "cylinder": _create_cylinder,
+    "prism": _create_prism,
+    "circle": _create_circle,
+    "rectangle": _create_rectangle,
+    "face": _create_face,
+    "wire": _create_wire,
+    "vertex": _create_vertex,
+    "edge": _create_edge,
+    "cube": _create_cube,
+}
+
+class ObjectSpec(BaseModel):
+    """One object to build with create_many. Only the fields used by its kind are set."""
+    kind: Literal["cube", "cylinder", "prism", "circle", "rectangle", "face", "wire", "vertex", "edge"] = Field(
+        description="kind of object to create."
+    )
+    name: Optional[str] = Field(default=None, description="custom name of the object.")
+    # Flat, typed parameters: Gemini declares property-less objects as STRING, so a free-form
+    # params dict would arrive as text
+    size: Optional[float] = Field(default=None, description="cube: size of the cube.")
+    radius: Optional[float] = Field(default=None, description="cylinder, circle: radius.")
+    height: Optional[float] = Field(default=None, description="cylinder, prism: height.")
+    width: Optional[float] = Field(default=None, description="prism, rectangle: width.")
+    length: Optional[float] = Field(default=None, description="prism, rectangle: length.")
+    origin: Optional[List[float]] = Field(default=None, description="cube, circle, rectangle: [x, y, z] origin.")
+    points: Optional[List[List[float]]] = Field(default=None, description="face, wire: list of [x, y, z] points.")
+    is_closed: Optional[bool] = Field(default=None, description="wire: whether the wire is closed.")
+    start: Optional[List[float]] = Field(default=None, description="edge: [x, y, z] start point.")
+    end: Optional[List[float]] = Field(default=None, description="edge: [x, y, z] end point.")
+    position: Optional[List[float]] = Field(default=None, description="vertex: [x, y, z] position.")
+
+def _create_from_spec(session: TopologicSession, spec):
+    try:
+        if not isinstance(spec, ObjectSpec):
+            spec = ObjectSpec.model_validate(spec)
+    except Exception as e:
+        return f"Error: Invalid object spec {spec!r}: {e}"
     
-    return f"A cube with name {name} has been created and registered"
+    try:
+        params = spec.model_dump(exclude={"kind", "name"}, exclude_none=True)
+        return _CREATORS[spec.kind](session, **params, name=spec.name)
+    except Exception as e:
+        # Reported inline so the rest of the batch still runs
+        return f"Error: Could not create '{spec.kind}': {e}"
+
+@tool
+def create_many(
+    runtime: ToolRuntime[SessionContext],
+    specs: List[ObjectSpec]
+):
+    """Creates several objects in one call. Prefer it over single create tools when building more than one object.
+    Args:
+        specs: A list of objects to create, each with a kind, the parameters of the matching create tool and an optional name.
+    """
+    # Built serially so names and session order follow the spec order
+    results = [_create_from_spec(runtime.context.session, spec) for spec in specs]
+    return "\n".join(results)
 
 @tool
 def get_object_info(
@@ -241,6 +392,8 @@ def get_object_info(
     name: str,
 ):
     """Retrieves information about an object in the current session by its name."""
+    from topologicpy.Vertex import Vertex
+
     obj = runtime.context.session.get(name)
     if obj is None:
         return f"No object found with the name '{name}'."
@@ -271,5 +424,5 @@ def clear_session(
     runtime: ToolRuntime[SessionContext],
 ):
     """Delete/Clear all objects from current session."""
-    runtime.context.session.items = {}
+    runtime.context.session.clear_items()
     return f"The session has been deleted"